@@ -1,105 +1,82 @@
 import os
 import re
 import json
+import dbm
+import hashlib
+import shelve
+import threading
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Dict, Set
+from typing import List, Dict, Set, FrozenSet, Iterator, Tuple
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_ollama import ChatOllama
 from langchain_core.output_parsers import StrOutputParser
 
+try:
+    import orjson  # Optional: much faster serialization of the report
+except ImportError:
+    orjson = None
+
+
+LANG_MAP = {
+    ".py": "Python",
+    ".js": "JavaScript",
+    ".ts": "TypeScript",
+    ".tsx": "TypeScript",
+    ".jsx": "JavaScript",
+    ".java": "Java",
+    ".cpp": "C++",
+    ".c": "C",
+    ".cs": "C#",
+    ".php": "PHP",
+    ".rb": "Ruby",
+    ".go": "Go",
+    ".rs": "Rust",
+    ".swift": "Swift",
+    ".kt": "Kotlin",
+    ".scala": "Scala",
+    ".html": "HTML",
+    ".css": "CSS",
+    ".scss": "SCSS",
+    ".sql": "SQL",
+}
+
+FILE_ICONS = {
+    ".py": "🐍",
+    ".js": "📜",
+    ".ts": "📘",
+    ".tsx": "⚛️",
+    ".jsx": "⚛️",
+    ".html": "🌐",
+    ".css": "🎨",
+    ".scss": "🎨",
+    ".json": "📋",
+    ".md": "📖",
+    ".txt": "📄",
+    ".yml": "⚙️",
+    ".yaml": "⚙️",
+    ".dockerfile": "🐳",
+    ".sql": "🗄️",
+    ".sh": "⚡",
+    ".bat": "⚡",
+    ".xml": "📄",
+    ".csv": "📊",
+    ".log": "📝",
+    ".env": "🔐",
+    "": "📄",
+}
 
-class ProjectAnalyzer:
-    def __init__(
-        self,
-        base_url="http://localhost:11434",
-        model="phi4-mini:3.8b",
-        temperature=0.3,
-        timeout=60,
-        max_files=1000,  # NEW: Configurable maximum file count
-    ):
-        self.chat_model = ChatOllama(
-            base_url=base_url, model=model, temperature=temperature, timeout=timeout
-        )
-        self.max_files = max_files  # Store as instance variable
-        self.default_ignore = {
-            "__pycache__",
-            ".git",
-            ".gitignore",
-            ".DS_Store",
-            "node_modules",
-            "uploads",
-            "test-ledger",
-            "target",
-            ".env",
-            ".venv",
-            "venv",
-            "env",
-            ".pytest_cache",
-            ".mypy_cache",
-            "dist",
-            "build",
-            ".idea",
-            ".vscode",
-            "*.pyc",
-            "*.pyo",
-            "*.pyd",
-            ".coverage",
-            "htmlcov",
-            ".tox",
-            ".cache",
-            "eggs",
-            "*.egg-info",
-            "logs",
-            "*.log",
-            ".npm",
-            ".yarn",
-            "package-lock.json",
-            "yarn.lock",
-        }
-        self.code_extensions = {
-            ".py",
-            ".js",
-            ".ts",
-            ".tsx",
-            ".jsx",
-            ".java",
-            ".cpp",
-            ".c",
-            ".h",
-            ".cs",
-            ".php",
-            ".rb",
-            ".go",
-            ".rs",
-            ".swift",
-            ".kt",
-            ".scala",
-            ".html",
-            ".css",
-            ".scss",
-            ".sass",
-            ".less",
-            ".vue",
-            ".svelte",
-            ".sql",
-            ".sh",
-            ".bat",
-            ".ps1",
-            ".yml",
-            ".yaml",
-            ".json",
-            ".xml",
-            ".md",
-            ".rst",
-            ".txt",
-            ".dockerfile",
-            ".config",
-            ".conf",
-        }
 
-    def should_ignore(self, path: Path, ignore_patterns: Set[str]) -> bool:
-        # These folders must be blocked no matter how deep they are
-        BLOCK_ANYWHERE = {
+class ProjectAnalyzer:
+    # These folders must be blocked no matter how deep they are. The walk
+    # never descends into an ignored directory, so checking the entry name
+    # at every level covers the whole path.
+    BLOCK_ANYWHERE = frozenset(
+        {
             "node_modules",
             ".git",
             "test-ledger",
@@ -113,56 +90,230 @@ class ProjectAnalyzer:
             ".pytest_cache",
             ".mypy_cache",
         }
+    )
 
-        # Check if any blocked folder appears anywhere in the path
-        if any(blocked in path.parts for blocked in BLOCK_ANYWHERE):
-            return True
+    # Content between ```json and ```
+    _JSON_FENCE_RE = re.compile(r"```json\s*(.*?)\s*```", re.DOTALL)
 
-        # Existing name-based and extension checks
-        name = path.name.lower()
-        if name in {p.lower() for p in ignore_patterns}:
-            return True
+    def __init__(
+        self,
+        base_url="http://localhost:11434",
+        model="phi4-mini:3.8b",
+        temperature=0.3,
+        timeout=60,
+        max_files=1000,  # NEW: Configurable maximum file count
+        stat_threads=16,  # Worker threads for the directory walk
+        llm_workers=4,  # Concurrent Ollama requests; lower if it gets overloaded
+        cache_path=".desc_cache",  # Description response cache; None disables it
+    ):
+        # keep_alive=-1 keeps the model loaded between calls so its prompt
+        # cache survives across requests
+        self.chat_model = ChatOllama(
+            base_url=base_url,
+            model=model,
+            temperature=temperature,
+            timeout=timeout,
+            keep_alive=-1,
+        )
+        self.max_files = max_files  # Store as instance variable
+        self.stat_threads = stat_threads
+        self.llm_workers = llm_workers
+        self.cache_path = cache_path
+        self._cache_lock = threading.Lock()
+        self.default_ignore = frozenset(
+            {
+                "__pycache__",
+                ".git",
+                ".gitignore",
+                ".DS_Store",
+                "node_modules",
+                "uploads",
+                "test-ledger",
+                "target",
+                ".env",
+                ".venv",
+                "venv",
+                "env",
+                ".pytest_cache",
+                ".mypy_cache",
+                "dist",
+                "build",
+                ".idea",
+                ".vscode",
+                "*.pyc",
+                "*.pyo",
+                "*.pyd",
+                ".coverage",
+                "htmlcov",
+                ".tox",
+                ".cache",
+                "eggs",
+                "*.egg-info",
+                "logs",
+                "*.log",
+                ".npm",
+                ".yarn",
+                "package-lock.json",
+                "yarn.lock",
+            }
+        )
+        self.code_extensions = frozenset(
+            {
+                ".py",
+                ".js",
+                ".ts",
+                ".tsx",
+                ".jsx",
+                ".java",
+                ".cpp",
+                ".c",
+                ".h",
+                ".cs",
+                ".php",
+                ".rb",
+                ".go",
+                ".rs",
+                ".swift",
+                ".kt",
+                ".scala",
+                ".html",
+                ".css",
+                ".scss",
+                ".sass",
+                ".less",
+                ".vue",
+                ".svelte",
+                ".sql",
+                ".sh",
+                ".bat",
+                ".ps1",
+                ".yml",
+                ".yaml",
+                ".json",
+                ".xml",
+                ".md",
+                ".rst",
+                ".txt",
+                ".dockerfile",
+                ".config",
+                ".conf",
+            }
+        )
+        if cache_path:
+            # The shelve files (name, name.db, name.dat, ...) must not be
+            # analyzed as project files when the cache sits inside the project
+            self.default_ignore = self.default_ignore | {
+                os.path.basename(cache_path) + "*"
+            }
+        self._ignore_rules = self._compile_ignore_patterns(self.default_ignore)
+
+    def _compile_ignore_patterns(
+        self, ignore_patterns: Set[str]
+    ) -> Tuple[FrozenSet[str], Tuple[str, ...], Tuple[str, ...]]:
+        """
+        Split ignore patterns into exact names, "*suffix" and "prefix*" rules
+        so each entry can be checked with a set lookup and two C-level calls.
+        """
+        exact = set(self.BLOCK_ANYWHERE)
+        suffixes = []
+        prefixes = []
         for pattern in ignore_patterns:
-            if pattern.startswith("*.") and name.endswith(pattern[1:].lower()):
-                return True
+            pattern = pattern.lower()
+            if pattern.startswith("*"):
+                suffixes.append(pattern[1:])
+            elif pattern.endswith("*"):
+                prefixes.append(pattern[:-1])
+            else:
+                exact.add(pattern)
+        return frozenset(exact), tuple(suffixes), tuple(prefixes)
 
-        return False
+    def should_ignore(self, name: str, ignore_rules=None) -> bool:
+        exact, suffixes, prefixes = ignore_rules or self._ignore_rules
+        name = name.lower()
+        return name in exact or name.endswith(suffixes) or name.startswith(prefixes)
 
     def extract_json_from_markdown(self, response):
         """
         Extracts JSON content from a markdown-formatted response.
         Looks for content within ```json ... ``` blocks.
         """
-        # Look for content between ```json and ```
-        match = re.search(r"```json\s*(.*?)\s*```", response, re.DOTALL)
+        # Cheap substring check skips the regex engine when there is no block
+        if "```json" not in response:
+            return None
+        match = self._JSON_FENCE_RE.search(response)
         if match:
             return match.group(1)
         return None  # Return None if no JSON block is found
 
-    def get_file_info(self, file_path: Path) -> Dict:
+    def get_file_meta(self, entry: os.DirEntry) -> Dict:
         try:
-            stat = file_path.stat()
-            file_info = {
-                "name": file_path.name,
-                "path": str(file_path),
-                "size": stat.st_size,  # Fixed the typo here
-                "extension": file_path.suffix.lower(),
-                "is_code": file_path.suffix.lower() in self.code_extensions,
+            # DirEntry.stat() is cached from the directory read where possible
+            stat = entry.stat()
+            # Same result as Path.suffix: dotfiles and a trailing dot have no suffix
+            name = entry.name
+            dot = name.rfind(".")
+            extension = name[dot:].lower() if 0 < dot < len(name) - 1 else ""
+            return {
+                "name": entry.name,
+                "path": entry.path,
+                "size": stat.st_size,
+                "extension": extension,
+                "is_code": extension in self.code_extensions,
                 "content_preview": None,
             }
-            if file_info["is_code"] and stat.st_size < 50000:
-                try:
-                    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                        content = f.read()
-                        file_info["content_preview"] = (
-                            content[:500] + "..." if len(content) > 500 else content
-                        )
-                        file_info["line_count"] = len(content.splitlines())
-                except Exception:
-                    pass
-            return file_info
         except Exception as e:
-            return {"name": file_path.name, "path": str(file_path), "error": str(e)}
+            return {"name": entry.name, "path": entry.path, "error": str(e)}
+
+    def _count_line_breaks(self, chunk: bytes, previous: bytes) -> int:
+        """Count \\n, \\r\\n and \\r line breaks, as text-mode reading would."""
+        breaks = chunk.count(b"\n") + chunk.count(b"\r") - chunk.count(b"\r\n")
+        # A \r\n split across two reads was already counted for the \r
+        if previous == b"\r" and chunk[:1] == b"\n":
+            breaks -= 1
+        return breaks
+
+    def read_preview(self, file_path: str):
+        """Return (content_preview, line_count) for a file, or None if unreadable."""
+        try:
+            # O_BINARY stops Windows from ending the read at a Ctrl-Z byte
+            fd = os.open(file_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+            try:
+                # Preview files are under 50 KB, so one read normally returns
+                # the whole file. Lines are counted with bytes.count, a C loop,
+                # and only the first 2000 bytes (always enough for 500 UTF-8
+                # characters) are decoded.
+                data = os.read(fd, 50000)
+                size = len(data)
+                newlines = self._count_line_breaks(data, b"")
+                last = data[-1:]
+                # A short first read means end of file was reached, so only a
+                # full one can leave more of the file to count
+                if size == 50000:
+                    while True:
+                        chunk = os.read(fd, 65536)
+                        if not chunk:
+                            break
+                        size += len(chunk)
+                        newlines += self._count_line_breaks(chunk, last)
+                        last = chunk[-1:]
+            finally:
+                os.close(fd)
+        except OSError:
+            return None
+        head = data[:2000]
+        # Normalize newlines the way the text-mode read used to
+        content = (
+            head.decode("utf-8", errors="ignore")
+            .replace("\r\n", "\n")
+            .replace("\r", "\n")
+        )
+        if len(content) > 500 or size > len(head):
+            preview = content[:500] + "..."
+        else:
+            preview = content
+        # A final line without a line break still counts as a line
+        line_count = newlines + (1 if size and last not in (b"\n", b"\r") else 0)
+        return preview, line_count
 
     def analyze_directory(
         self, root_path: str, ignore_folders: List[str] = None
@@ -173,143 +324,188 @@ class ProjectAnalyzer:
                 f"Project path does not exist or is not a directory: {root_path}"
             )
 
-        ignore_patterns = self.default_ignore.copy()
+        ignore_rules = self._ignore_rules
         if ignore_folders:
-            ignore_patterns.update(ignore_folders)
+            ignore_rules = self._compile_ignore_patterns(
+                self.default_ignore.union(ignore_folders)
+            )
 
         project_info = {
             "project_name": root.name,
             "root_path": str(root),
-            "structure": {},
+            "structure": [],
             "files": [],
             "directories": [],
-            "statistics": {
-                "total_files": 0,
-                "total_directories": 0,
-                "code_files": 0,
-                "total_size": 0,
-                "file_types": {},
-                "languages": set(),
-            },
+            "statistics": {},
         }
 
-        def scan_directory(current_path: Path, relative_path: str = ""):
-            items = []
+        # Files are counted by the workers before they are statted, so once
+        # the limit is crossed no further per-file work is started anywhere
+        file_count = 0
+        count_lock = threading.Lock()
+        limit_reached = threading.Event()
+
+        def scan_one(current_path: str) -> List:
+            # Runs on a worker thread: read one directory and stat its files
+            nonlocal file_count
+            children = []
+            if limit_reached.is_set():
+                return children
             try:
-                for item in sorted(current_path.iterdir()):
-                    if self.should_ignore(item, ignore_patterns):
-                        continue
-
-                    item_relative = (
-                        os.path.join(relative_path, item.name)
-                        if relative_path
-                        else item.name
+                # Entries are taken in directory order; the tree is sorted by
+                # name once the walk is complete
+                with os.scandir(current_path) as it:
+                    for item in it:
+                        if self.should_ignore(item.name, ignore_rules):
+                            continue
+                        if item.is_dir(follow_symlinks=False):
+                            children.append((item, None))
+                            continue
+                        # Links to directories are neither descended into
+                        # nor reported as files
+                        if item.is_symlink() and item.is_dir():
+                            continue
+                        with count_lock:
+                            file_count += 1
+                            over_limit = file_count > self.max_files
+                        if over_limit:
+                            limit_reached.set()
+                            break
+                        children.append((item, self.get_file_meta(item)))
+            except PermissionError:
+                pass
+            return children
+
+        # Breadth-first walk: every discovered directory is scanned on the pool
+        # so many scandir/stat calls are in flight at once, while the tree
+        # itself is only ever touched from this thread.
+        file_infos = {}
+        with ThreadPoolExecutor(max_workers=self.stat_threads) as pool:
+            pending = {
+                pool.submit(scan_one, str(root)): (project_info["structure"], "")
+            }
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                if limit_reached.is_set():
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    raise ValueError(
+                        f"Project contains more than {self.max_files} files. Aborting analysis."
                     )
-
-                    if item.is_dir():
-                        project_info["statistics"]["total_directories"] += 1
-                        project_info["directories"].append(item_relative)
-                        sub_items = scan_directory(item, item_relative)
-                        items.append(
-                            {
-                                "name": item.name,
-                                "type": "directory",
-                                "path": item_relative,
-                                "items": sub_items,
-                            }
-                        )
-                    else:
-                        project_info["statistics"]["total_files"] += 1
-                        # UPDATED: Use self.max_files instead of hardcoded value
-                        if project_info["statistics"]["total_files"] > self.max_files:
-                            raise ValueError(
-                                f"Project contains more than {self.max_files} files. Aborting analysis."
-                            )
-
-                        file_info = self.get_file_info(item)
-                        file_info["relative_path"] = item_relative
-                        project_info["files"].append(file_info)
-                        project_info["statistics"]["total_size"] += file_info.get(
-                            "size", 0
+                for future in done:
+                    items, relative_path = pending.pop(future)
+                    for item, file_info in future.result():
+                        item_relative = (
+                            os.path.join(relative_path, item.name)
+                            if relative_path
+                            else item.name
                         )
 
-                        ext = file_info.get("extension", "")
-                        if ext:
-                            project_info["statistics"]["file_types"][ext] = (
-                                project_info["statistics"]["file_types"].get(ext, 0) + 1
+                        if file_info is None:
+                            sub_items = []
+                            items.append(
+                                {
+                                    "name": item.name,
+                                    "type": "directory",
+                                    "path": item_relative,
+                                    "items": sub_items,
+                                }
+                            )
+                            pending[pool.submit(scan_one, item.path)] = (
+                                sub_items,
+                                item_relative,
+                            )
+                        else:
+                            file_info["relative_path"] = item_relative
+                            file_infos[item_relative] = file_info
+                            items.append(
+                                {
+                                    "name": item.name,
+                                    "type": "file",
+                                    "path": item_relative,
+                                    "size": file_info.get("size", 0),
+                                    "extension": file_info.get("extension", ""),
+                                }
                             )
-                        if file_info.get("is_code"):
-                            project_info["statistics"]["code_files"] += 1
-                            lang_map = {
-                                ".py": "Python",
-                                ".js": "JavaScript",
-                                ".ts": "TypeScript",
-                                ".tsx": "TypeScript",
-                                ".jsx": "JavaScript",
-                                ".java": "Java",
-                                ".cpp": "C++",
-                                ".c": "C",
-                                ".cs": "C#",
-                                ".php": "PHP",
-                                ".rb": "Ruby",
-                                ".go": "Go",
-                                ".rs": "Rust",
-                                ".swift": "Swift",
-                                ".kt": "Kotlin",
-                                ".scala": "Scala",
-                                ".html": "HTML",
-                                ".css": "CSS",
-                                ".scss": "SCSS",
-                                ".sql": "SQL",
-                            }
-                            if ext in lang_map:
-                                project_info["statistics"]["languages"].add(
-                                    lang_map[ext]
-                                )
-
-                        items.append(
-                            {
-                                "name": item.name,
-                                "type": "file",
-                                "path": item_relative,
-                                "size": file_info.get("size", 0),
-                                "extension": ext,
-                            }
-                        )
-            except PermissionError:
-                pass
-            return items
 
-        project_info["structure"] = scan_directory(root)
-        project_info["statistics"]["languages"] = list(
-            project_info["statistics"]["languages"]
-        )
+            # Previews are read once the walk is done, with the reads
+            # overlapping each other on the same pool
+            preview_files = [
+                file_info
+                for file_info in file_infos.values()
+                if file_info.get("is_code") and file_info["size"] < 50000
+            ]
+            previews = pool.map(
+                self.read_preview, [file_info["path"] for file_info in preview_files]
+            )
+            for file_info, preview in zip(preview_files, previews):
+                if preview is not None:
+                    file_info["content_preview"], file_info["line_count"] = preview
+
+        def collect(items: List[Dict]):
+            # Sort each level by name for the tree view, then flatten in tree
+            # order so results match a sorted depth-first walk
+            items.sort(key=itemgetter("name"))
+            for item in items:
+                if item["type"] == "directory":
+                    project_info["directories"].append(item["path"])
+                    collect(item["items"])
+                else:
+                    project_info["files"].append(file_infos[item["path"]])
+
+        collect(project_info["structure"])
+
+        # Statistics are computed in bulk from flat columns of the file list
+        # rather than updated entry by entry during the walk
+        files = project_info["files"]
+        extensions = [file_info.get("extension", "") for file_info in files]
+        code_extensions = [
+            ext for file_info, ext in zip(files, extensions) if file_info.get("is_code")
+        ]
+        project_info["statistics"] = {
+            "total_files": len(files),
+            "total_directories": len(project_info["directories"]),
+            "code_files": len(code_extensions),
+            "total_size": sum(file_info.get("size", 0) for file_info in files),
+            "file_types": dict(Counter(ext for ext in extensions if ext)),
+            "languages": list(
+                dict.fromkeys(
+                    LANG_MAP[ext] for ext in code_extensions if ext in LANG_MAP
+                )
+            ),
+        }
         return project_info
 
-    def generate_tree_view(
-        self, structure: List[Dict], prefix: str = "", is_last: bool = True
-    ) -> str:
-        tree = ""
+    def _build_tree(self, structure: List[Dict], prefix: str, out: List[str]):
         for i, item in enumerate(structure):
             is_last_item = i == len(structure) - 1
             current_prefix = "└─ " if is_last_item else "├─ "
-            tree += f"{prefix}{current_prefix}{item['name']}\n"
+            out.append(f"{prefix}{current_prefix}{item['name']}\n")
             if item["type"] == "directory" and "items" in item:
                 extension = "   " if is_last_item else "│  "
-                tree += self.generate_tree_view(
-                    item["items"], prefix + extension, is_last_item
-                )
-        return tree
-
-    def create_summary_prompt(self, project_info: Dict) -> str:
+                self._build_tree(item["items"], prefix + extension, out)
+
+    def generate_tree_view(self, structure: List[Dict], prefix: str = "") -> str:
+        # Lines are collected in one list and joined once, keeping this linear
+        out = []
+        self._build_tree(structure, prefix, out)
+        return "".join(out)
+
+    def create_summary_prompt(self, project_info: Dict, tree_view: str = None) -> str:
+        if tree_view is None:
+            tree_view = self.generate_tree_view(project_info["structure"])
+        # Only the first 20 previews from the first 50 files make it into the
+        # prompt, so stop building entries once there are enough
         file_summary = []
-        for file_info in project_info["files"][:50]:
-            if file_info.get("is_code") and file_info.get("content_preview"):
-                file_summary.append(
-                    f"File: {file_info['relative_path']}\n"
-                    f"Language: {file_info.get('extension', 'unknown')}\n"
-                    f"Preview: {file_info['content_preview'][:200]}...\n"
-                )
+        for file_info in islice(project_info["files"], 50):
+            if not (file_info.get("is_code") and file_info.get("content_preview")):
+                continue
+            file_summary.append(
+                f"File: {file_info['relative_path']}\n"
+                f"Language: {file_info.get('extension', 'unknown')}\n"
+                f"Preview: {file_info['content_preview'][:200]}...\n"
+            )
+            if len(file_summary) == 20:
+                break
         stats = project_info["statistics"]
         prompt_data = f"""
 PROJECT ANALYSIS REQUEST
@@ -326,10 +522,21 @@ STATISTICS:
 - File Types: {dict(list(stats['file_types'].items())[:10])}
 
 PROJECT STRUCTURE:
-{self.generate_tree_view(project_info['structure'])}
+{tree_view}
 
 KEY FILES CONTENT PREVIEW:
-{chr(10).join(file_summary[:20])}
+{chr(10).join(file_summary)}
+"""
+        return prompt_data
+
+    def generate_summary(self, project_info: Dict, tree_view: str = None) -> str:
+        # Static instructions go first as the system message so Ollama can reuse
+        # their cached prefix; only the project data varies between calls
+        prompt_template = ChatPromptTemplate.from_messages(
+            [
+                (
+                    "system",
+                    """You are an expert software architect providing a detailed analysis of this project. Write as if you are confidently describing what this project IS and DOES.
 
 Please provide a comprehensive analysis of this project including:
 1. Project type and purpose (based on structure and files)
@@ -338,14 +545,6 @@ Please provide a comprehensive analysis of this project including:
 4. Code quality observations
 5. Potential areas for improvement
 6. Overall assessment and recommendations
-"""
-        return prompt_data
-
-    def generate_summary(self, project_info: Dict) -> str:
-        prompt_template = ChatPromptTemplate.from_template(
-            """You are an expert software architect providing a detailed analysis of this project. Write as if you are confidently describing what this project IS and DOES.
-
-{project_data}
 
 Provide your analysis using confident, definitive language. Avoid tentative phrases like "appears to be", "seems to", "likely", "probably", "suggests". Instead use direct statements about what the project IS, CONTAINS, and ACCOMPLISHES.
 
@@ -355,9 +554,12 @@ Examples of confident language:
 - "The codebase IMPLEMENTS advanced algorithms..."
 - "This system PROVIDES real-time data processing..."
 
-Cover all the requested points with specific, insightful observations using definitive language."""
+Cover all the requested points with specific, insightful observations using definitive language.""",
+                ),
+                ("human", "{project_data}"),
+            ]
         )
-        prompt_data = self.create_summary_prompt(project_info)
+        prompt_data = self.create_summary_prompt(project_info, tree_view)
         try:
             llm_chain = prompt_template | self.chat_model | StrOutputParser()
             summary = llm_chain.invoke({"project_data": prompt_data})
@@ -368,24 +570,32 @@ Cover all the requested points with specific, insightful observations using defi
     def generate_natural_description(self, project_info: Dict) -> str:
         """Generate a natural, user-friendly description of what the project is about"""
         file_summary = []
-        for file_info in project_info["files"][:20]:  # Limit to top 20 files
-            if file_info.get("is_code") and file_info.get("content_preview"):
-                file_summary.append(
-                    f"File: {file_info['relative_path']}\n"
-                    f"Extension: {file_info.get('extension', 'unknown')}\n"
-                    f"Preview: {file_info['content_preview'][:300]}...\n"
-                )
+        for file_info in islice(project_info["files"], 20):  # Limit to top 20 files
+            if not (file_info.get("is_code") and file_info.get("content_preview")):
+                continue
+            file_summary.append(
+                f"File: {file_info['relative_path']}\n"
+                f"Extension: {file_info.get('extension', 'unknown')}\n"
+                f"Preview: {file_info['content_preview'][:300]}...\n"
+            )
+            if len(file_summary) == 10:  # Only 10 previews are sent
+                break
 
         stats = project_info["statistics"]
 
         # Get main file types for context
         main_files = []
-        for file_info in project_info["files"][:10]:
+        for file_info in islice(project_info["files"], 10):
             if file_info.get("is_code"):
                 main_files.append(f"{file_info['name']}")
+                if len(main_files) == 5:
+                    break
 
-        prompt_template = ChatPromptTemplate.from_template(
-            """You are writing a project description as if you are the project owner introducing YOUR project to others.
+        prompt_template = ChatPromptTemplate.from_messages(
+            [
+                (
+                    "system",
+                    """You are writing a project description as if you are the project owner introducing YOUR project to others.
 
 Write a brief, confident description (2-3 paragraphs) that explains what this project IS and DOES. Make it:
 - Written in first person or direct statements (avoid "appears to be", "seems like", "likely", "probably")
@@ -394,16 +604,6 @@ Write a brief, confident description (2-3 paragraphs) that explains what this pr
 - Use appropriate emojis where they add value (but don't overdo it)
 - Focus on the project's purpose and functionality
 
-PROJECT DETAILS:
-Project Name: {project_name}
-Languages: {languages}
-Total Files: {total_files}
-Main Files: {main_files}
-File Types: {file_types}
-
-KEY FILES PREVIEW:
-{file_preview}
-
 Write as if you're the creator saying "This project is..." or "I built this to..." or simply state what it does directly. 
 
 Examples of what TO do:
@@ -417,7 +617,21 @@ Examples of what NOT to do:
 - "It likely handles..."
 - "Based on the structure, this looks like..."
 
-Be definitive, confident, and direct about what the project IS and DOES."""
+Be definitive, confident, and direct about what the project IS and DOES.""",
+                ),
+                (
+                    "human",
+                    """PROJECT DETAILS:
+Project Name: {project_name}
+Languages: {languages}
+Total Files: {total_files}
+Main Files: {main_files}
+File Types: {file_types}
+
+KEY FILES PREVIEW:
+{file_preview}""",
+                ),
+            ]
         )
 
         try:
@@ -432,7 +646,7 @@ Be definitive, confident, and direct about what the project IS and DOES."""
                     ),
                     "total_files": stats["total_files"],
                     "main_files": (
-                        ", ".join([f"`{f}`" for f in main_files[:5]])
+                        ", ".join([f"`{f}`" for f in main_files])
                         if main_files
                         else "No main files identified"
                     ),
@@ -442,7 +656,7 @@ Be definitive, confident, and direct about what the project IS and DOES."""
                             for ext, count in list(stats["file_types"].items())[:5]
                         ]
                     ),
-                    "file_preview": "\n".join(file_summary[:10]),
+                    "file_preview": "\n".join(file_summary),
                 }
             )
             return description.strip()
@@ -462,8 +676,138 @@ This project contains {stats['total_files']} files organized across {stats['tota
 
 Based on the file structure and technology stack, this is a well-organized codebase that's designed for collaboration and active development! 💻✨"""
 
-    def generate_descriptions(self, project_info: Dict) -> Dict:
-        descriptions = {"directories": {}, "files": {}}
+    def _cache_key(self, prompt_template, variables: Dict) -> str:
+        """Hash of the fully rendered prompt and the model settings that answer it."""
+        payload = json.dumps(
+            {
+                "model": self.chat_model.model,
+                "temperature": self.chat_model.temperature,
+                "prompt": prompt_template.format(**variables),
+            }
+        )
+        return hashlib.blake2b(payload.encode("utf-8")).hexdigest()
+
+    def _unavailable(self, dir_path: str, batch: List[str], reason: str):
+        message = f"Description unavailable due to {reason}"
+        file_descriptions = {
+            os.path.join(dir_path, filename): message for filename in batch
+        }
+        return dir_path, message, file_descriptions
+
+    def _open_cache(self):
+        """Open the response cache, or return None if it is disabled or unusable."""
+        if not self.cache_path:
+            return None
+        try:
+            return shelve.open(self.cache_path)
+        except (OSError, *dbm.error) as e:
+            # The cache is only an optimization; run without it
+            print(f"Could not open description cache {self.cache_path}: {e}")
+            return None
+
+    def _invoke_batch(self, chains, cache, task):
+        """
+        Describe one batch of files from a single directory, or several small
+        directories in one request. Runs on a worker thread and returns a
+        (dir_path, dir_description, file_descriptions) tuple per directory.
+        """
+        multi = len(task) > 1
+        prompt_template, llm_chain = chains[multi]
+        if multi:
+            variables = {
+                "directories": "\n".join(
+                    f'- "{dir_path}": {", ".join(batch)}' for dir_path, batch in task
+                )
+            }
+        else:
+            dir_path, batch = task[0]
+            variables = {
+                "directory": dir_path,
+                "file_list": ", ".join(batch) if batch else "No files",
+            }
+        label = ", ".join(dir_path for dir_path, _ in task)
+        print(f"Generating descriptions for directory: {label}")
+        response_content = None
+        try:
+            cache_key = None
+            response = None
+            if cache is not None:
+                cache_key = self._cache_key(prompt_template, variables)
+                try:
+                    with self._cache_lock:
+                        response = cache.get(cache_key)
+                except Exception as e:
+                    print(f"Ignoring unreadable cache entry for {label}: {e}")
+            if response is not None:
+                print(f"Using cached LLM response for {label}")
+            else:
+                response = llm_chain.invoke(variables)
+                # Log the raw response for debugging
+                print(f"Raw LLM Response for {label}: '{response}'")
+
+            # Extract JSON content from the response
+            response_content = self.extract_json_from_markdown(response)
+            if not response_content:
+                print(f"No JSON found in response for {label}: '{response}'")
+                return [
+                    self._unavailable(dir_path, batch, "missing JSON")
+                    for dir_path, batch in task
+                ]
+
+            print(f"Extracted JSON for {label}: '{response_content}'")
+            # Parse the extracted JSON
+            data = json.loads(response_content)
+            if multi:
+                data = {key.strip().rstrip("/"): value for key, value in data.items()}
+            else:
+                data = {task[0][0]: data}
+
+            results = []
+            missing = False
+            for dir_path, batch in task:
+                dir_data = data.get(dir_path)
+                if not isinstance(dir_data, dict):
+                    print(f"No entry for {dir_path} in response for {label}")
+                    missing = True
+                    results.append(self._unavailable(dir_path, batch, "missing JSON"))
+                    continue
+                file_descriptions = {
+                    os.path.join(dir_path, filename): desc
+                    for filename, desc in dir_data.get("files", {}).items()
+                }
+                results.append(
+                    (
+                        dir_path,
+                        dir_data.get(
+                            "directory_description", "Description unavailable"
+                        ),
+                        file_descriptions,
+                    )
+                )
+            # Only replay responses that described every directory asked about
+            if cache_key is not None and not missing:
+                try:
+                    with self._cache_lock:
+                        cache[cache_key] = response
+                except Exception as e:
+                    print(f"Could not cache response for {label}: {e}")
+            return results
+        except json.JSONDecodeError as e:
+            print(f"JSON Parsing Error for {label}: {e}")
+            print(f"Failed Response: '{response_content}'")
+            reason = "JSON parsing error"
+        except Exception as e:
+            print(f"Unexpected Error for {label}: {e}")
+            reason = "unexpected error"
+        return [self._unavailable(dir_path, batch, reason) for dir_path, batch in task]
+
+    def iter_descriptions(
+        self, project_info: Dict
+    ) -> Iterator[Tuple[str, str, Dict[str, str]]]:
+        """
+        Yield (dir_path, dir_description, file_descriptions) for each directory
+        as soon as every batch for that directory has been answered.
+        """
         files_by_dir = {}
         for file_info in project_info["files"]:
             dir_path = os.path.dirname(file_info["relative_path"]) or "root"
@@ -471,123 +815,159 @@ Based on the file structure and technology stack, this is a well-organized codeb
                 files_by_dir[dir_path] = []
             files_by_dir[dir_path].append(file_info)
 
-        for dir_path in list(files_by_dir.keys()) + [
+        prompt_template = ChatPromptTemplate.from_messages(
+            [
+                (
+                    "system",
+                    """
+            For the directory you are given, and the files it contains, provide:
+            1. A brief description of what the directory IS and DOES (1-2 sentences) - use confident, definitive language
+            2. A brief description for each file explaining what it IS and DOES (1-2 sentences) - use confident, definitive language
+
+            Use confident language like "contains", "provides", "handles", "implements" instead of "appears to", "seems to", "likely".
+
+            Respond **only** with a valid JSON object in this format:
+            {{
+                "directory_description": "Description of what this directory is and does",
+                "files": {{
+                    "file1.py": "Description of what this file is and does",
+                    "file2.py": "Description of what this file is and does"
+                }}
+            }}
+            """,
+                ),
+                ("human", 'Directory: "{directory}"\nFiles: {file_list}'),
+            ]
+        )
+        multi_prompt_template = ChatPromptTemplate.from_messages(
+            [
+                (
+                    "system",
+                    """
+            For each directory you are given, and the files it contains, provide:
+            1. A brief description of what the directory IS and DOES (1-2 sentences) - use confident, definitive language
+            2. A brief description for each file explaining what it IS and DOES (1-2 sentences) - use confident, definitive language
+
+            Use confident language like "contains", "provides", "handles", "implements" instead of "appears to", "seems to", "likely".
+
+            Respond **only** with a valid JSON object keyed by the exact directory paths given, in this format:
+            {{
+                "dir1": {{
+                    "directory_description": "Description of what this directory is and does",
+                    "files": {{
+                        "file1.py": "Description of what this file is and does",
+                        "file2.py": "Description of what this file is and does"
+                    }}
+                }},
+                "dir2": {{
+                    "directory_description": "Description of what this directory is and does",
+                    "files": {{
+                        "file3.py": "Description of what this file is and does"
+                    }}
+                }}
+            }}
+            """,
+                ),
+                ("human", "Directories:\n{directories}"),
+            ]
+        )
+        chains = (
+            (prompt_template, prompt_template | self.chat_model | StrOutputParser()),
+            (
+                multi_prompt_template,
+                multi_prompt_template | self.chat_model | StrOutputParser(),
+            ),
+        )
+
+        dir_paths = list(files_by_dir.keys()) + [
             d for d in project_info["directories"] if d not in files_by_dir
-        ]:
-            print(f"Generating descriptions for directory: {dir_path}")
+        ]
+        # Each task is a list of (dir_path, file batch). Large directories are
+        # split into batches of up to 40 files; runs of adjacent small
+        # directories are packed into one request of up to 40 files in total.
+        batch_size = 40
+        small_dir_files = 5
+        tasks = []
+        group = []
+        group_files = 0
+        for dir_path in dir_paths:
             file_list = [f["name"] for f in files_by_dir.get(dir_path, [])]
-            # Batch files if there are more than 10
-            batch_size = 10
-            file_batches = [
-                file_list[i : i + batch_size]
+            if not file_list:
+                continue
+            if len(file_list) < small_dir_files:
+                if group_files + len(file_list) > batch_size:
+                    tasks.append(group)
+                    group, group_files = [], 0
+                group.append((dir_path, file_list))
+                group_files += len(file_list)
+                continue
+            if group:
+                tasks.append(group)
+                group, group_files = [], 0
+            tasks.extend(
+                [(dir_path, file_list[i : i + batch_size])]
                 for i in range(0, len(file_list), batch_size)
-            ]
-
+            )
+        if group:
+            tasks.append(group)
+
+        # Responses are cached on disk by prompt hash, so unchanged directories
+        # are answered without a round-trip on later runs. The key covers the
+        # whole task: adding, removing or renaming a file in one small
+        # directory also re-asks about every directory packed with it.
+        cache = self._open_cache()
+        try:
+            # Ollama serves several requests at once, so batches are sent
+            # concurrently and merged here in submission order. A directory's
+            # batches are contiguous, so it is complete once the next one starts.
+            current = None
             dir_description = ""
             file_descriptions = {}
-
-            for batch in file_batches:
-                prompt_template = ChatPromptTemplate.from_template(
-                    """
-                    For the directory "{directory}", which contains the files: {file_list}, provide:
-                    1. A brief description of what the directory IS and DOES (1-2 sentences) - use confident, definitive language
-                    2. A brief description for each file explaining what it IS and DOES (1-2 sentences) - use confident, definitive language
-
-                    Use confident language like "contains", "provides", "handles", "implements" instead of "appears to", "seems to", "likely".
-
-                    Respond **only** with a valid JSON object in this format:
-                    {{
-                        "directory_description": "Description of what this directory is and does",
-                        "files": {{
-                            "file1.py": "Description of what this file is and does",
-                            "file2.py": "Description of what this file is and does"
-                        }}
-                    }}
-                    """
-                )
-                try:
-                    llm_chain = prompt_template | self.chat_model | StrOutputParser()
-                    response = llm_chain.invoke(
-                        {
-                            "directory": dir_path,
-                            "file_list": ", ".join(batch) if batch else "No files",
-                        }
-                    )
-                    # Log the raw response for debugging
-                    print(f"Raw LLM Response for {dir_path}: '{response}'")
-
-                    # Extract JSON content from the response
-                    response_content = self.extract_json_from_markdown(response)
-                    if response_content:
-                        print(f"Extracted JSON for {dir_path}: '{response_content}'")
-                        # Parse the extracted JSON
-                        dir_data = json.loads(response_content)
+            with ThreadPoolExecutor(max_workers=self.llm_workers) as pool:
+                for results in pool.map(
+                    partial(self._invoke_batch, chains, cache), tasks
+                ):
+                    for dir_path, batch_description, batch_files in results:
+                        if dir_path != current:
+                            if current is not None:
+                                yield current, dir_description, file_descriptions
+                            current = dir_path
+                            dir_description, file_descriptions = "", {}
                         if not dir_description:
-                            dir_description = dir_data.get(
-                                "directory_description", "Description unavailable"
-                            )
-                        for filename, desc in dir_data.get("files", {}).items():
-                            file_path = os.path.join(dir_path, filename)
-                            file_descriptions[file_path] = desc
-                    else:
-                        print(f"No JSON found in response for {dir_path}: '{response}'")
-                        dir_description = "Description unavailable due to missing JSON"
-                        for filename in batch:
-                            file_path = os.path.join(dir_path, filename)
-                            file_descriptions[file_path] = (
-                                "Description unavailable due to missing JSON"
-                            )
-                except json.JSONDecodeError as e:
-                    print(f"JSON Parsing Error for {dir_path}: {e}")
-                    print(f"Failed Response: '{response_content}'")
-                    dir_description = (
-                        "Description unavailable due to JSON parsing error"
-                    )
-                    for filename in batch:
-                        file_path = os.path.join(dir_path, filename)
-                        file_descriptions[file_path] = (
-                            "Description unavailable due to JSON parsing error"
-                        )
-                except Exception as e:
-                    print(f"Unexpected Error for {dir_path}: {e}")
-                    dir_description = "Description unavailable due to unexpected error"
-                    for filename in batch:
-                        file_path = os.path.join(dir_path, filename)
-                        file_descriptions[file_path] = (
-                            "Description unavailable due to unexpected error"
-                        )
+                            dir_description = batch_description
+                        file_descriptions.update(batch_files)
+            if current is not None:
+                yield current, dir_description, file_descriptions
+        finally:
+            if cache is not None:
+                cache.close()
+
+        # Directories without files of their own are not sent to the model
+        for dir_path in dir_paths:
+            if dir_path not in files_by_dir:
+                yield dir_path, "", {}
 
+    def generate_descriptions(self, project_info: Dict) -> Dict:
+        descriptions = {"directories": {}, "files": {}}
+        for dir_path, dir_description, file_descriptions in self.iter_descriptions(
+            project_info
+        ):
             descriptions["directories"][dir_path] = dir_description
             descriptions["files"].update(file_descriptions)
-
         return descriptions
 
+    def _json_value(self, value, depth: int = 1) -> bytes:
+        """Serialize a value indented as if nested `depth` levels deep in the report."""
+        if orjson is not None:
+            data = orjson.dumps(
+                value, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            )
+        else:
+            data = json.dumps(value, indent=2, ensure_ascii=False).encode("utf-8")
+        return data.replace(b"\n", b"\n" + b"  " * depth)
+
     def get_file_icon(self, extension: str) -> str:
-        icons = {
-            ".py": "🐍",
-            ".js": "📜",
-            ".ts": "📘",
-            ".tsx": "⚛️",
-            ".jsx": "⚛️",
-            ".html": "🌐",
-            ".css": "🎨",
-            ".scss": "🎨",
-            ".json": "📋",
-            ".md": "📖",
-            ".txt": "📄",
-            ".yml": "⚙️",
-            ".yaml": "⚙️",
-            ".dockerfile": "🐳",
-            ".sql": "🗄️",
-            ".sh": "⚡",
-            ".bat": "⚡",
-            ".xml": "📄",
-            ".csv": "📊",
-            ".log": "📝",
-            ".env": "🔐",
-            "": "📄",
-        }
-        return icons.get(extension.lower(), "📄")
+        return FILE_ICONS.get(extension.lower(), "📄")
 
     def analyze_project(
         self,
@@ -603,31 +983,88 @@ Based on the file structure and technology stack, this is a well-organized codeb
             f"Found {project_info['statistics']['total_files']} files in {project_info['statistics']['total_directories']} directories"
         )
 
-        print("Generating natural project description...")
-        natural_description = self.generate_natural_description(project_info)
-
-        print("Generating LLM summary...")
-        llm_summary = self.generate_summary(project_info)
-
-        descriptions = {}
-        if generate_readme:
-            print("Generating detailed descriptions...")
-            descriptions = self.generate_descriptions(project_info)
+        # Built once and shared by the summary prompt and the report
+        tree_view = self.generate_tree_view(project_info["structure"])
 
         report = {
             "project_info": project_info,
-            "natural_description": natural_description,
-            "llm_summary": llm_summary,
-            "descriptions": descriptions,
-            "tree_view": (
-                self.generate_tree_view(project_info["structure"])
-                if include_tree
-                else None
-            ),
+            "natural_description": None,
+            "llm_summary": None,
+            "descriptions": {},
+            "tree_view": tree_view if include_tree else None,
         }
+        # Each section of the report is written as soon as it is ready,
+        # producing the same text json.dump(report, indent=2) would. It goes
+        # to a temporary file that only replaces output_file once complete, so
+        # a failed or interrupted run leaves any previous report intact.
+        tmp_file = f"{output_file}.tmp" if output_file else None
+        out = open(tmp_file, "wb") if tmp_file else None
+
+        def write(*parts):
+            # Values are passed as callables so nothing is serialized when
+            # there is no output file
+            if out:
+                for part in parts:
+                    out.write(part() if callable(part) else part)
+
+        try:
+            write(b'{\n  "project_info": ', partial(self._json_value, project_info))
+
+            print("Generating natural project description...")
+            report["natural_description"] = self.generate_natural_description(
+                project_info
+            )
+            write(
+                b',\n  "natural_description": ',
+                partial(self._json_value, report["natural_description"]),
+            )
+
+            print("Generating LLM summary...")
+            report["llm_summary"] = self.generate_summary(project_info, tree_view)
+            write(
+                b',\n  "llm_summary": ',
+                partial(self._json_value, report["llm_summary"]),
+            )
+
+            write(b',\n  "descriptions": ')
+            if generate_readme:
+                print("Generating detailed descriptions...")
+                descriptions = {"directories": {}, "files": {}}
+                report["descriptions"] = descriptions
+                write(b'{\n    "directories": {')
+                for entry in self.iter_descriptions(project_info):
+                    dir_path, dir_description, file_descriptions = entry
+                    write(
+                        b",\n      " if descriptions["directories"] else b"\n      ",
+                        partial(self._json_value, dir_path),
+                        b": ",
+                        partial(self._json_value, dir_description),
+                    )
+                    descriptions["directories"][dir_path] = dir_description
+                    descriptions["files"].update(file_descriptions)
+                write(
+                    b"\n    }" if descriptions["directories"] else b"}",
+                    b',\n    "files": ',
+                    partial(self._json_value, descriptions["files"], 2),
+                    b"\n  }",
+                )
+            else:
+                write(b"{}")
+
+            write(
+                b',\n  "tree_view": ',
+                partial(self._json_value, report["tree_view"]),
+                b"\n}",
+            )
+        except BaseException:
+            if out:
+                out.close()
+                os.remove(tmp_file)
+            raise
+        if out:
+            out.close()
+            os.replace(tmp_file, output_file)
         if output_file:
-            with open(output_file, "w", encoding="utf-8") as f:
-                json.dump(report, f, indent=2, ensure_ascii=False)
             print(f"Analysis saved to: {output_file}")
         return report
 
@@ -709,16 +1146,17 @@ PROJECT STRUCTURE:
             descriptions["files"].keys()
         )
         all_paths.sort()
-        flat_list = "## 📋 All Files and Directories\n\n"
+        parts = ["## 📋 All Files and Directories\n\n"]
         for path in all_paths:
             if path in descriptions["directories"]:
                 desc = descriptions["directories"][path]
-                flat_list += f"- 📁 **`{path}/`** - {desc}\n"
+                parts.append(f"- 📁 **`{path}/`** - {desc}\n")
             else:
                 desc = descriptions["files"][path]
                 ext = os.path.splitext(path)[1]
                 icon = analyzer.get_file_icon(ext)
-                flat_list += f"- {icon} **`{path}`** - {desc}\n"
+                parts.append(f"- {icon} **`{path}`** - {desc}\n")
+        flat_list = "".join(parts)
 
         # Create the complete README content with natural description first
         project_title = project_name.replace("_", " ").replace("-", " ").title()